@@ -0,0 +1,240 @@
+import os
+import sys
+import getpass
+import socket
+import platform
+from vfs import VirtualFileSystem, VFSException, format_mode
+
+# Сведения о системе не меняются за время работы, поэтому читаются один раз
+_USER = getpass.getuser()
+_HOST = socket.gethostname().split(".", 1)[0]
+_UNAME = f"{platform.system()} {_HOST} {platform.release()} Python/{platform.python_version()}"
+
+
+class ShellEmulator:
+    def __init__(self, prompt_template="{user}@{host}:{cwd}$ ", vfs_path=None):
+        # Инициализация эмулятора: имя пользователя, хост и виртуальная ФС
+        self.user = _USER
+        self.host = _HOST
+        self.prompt_template = prompt_template
+        self.running = True
+        self.vfs = None
+        # Готовое приглашение и каталог, для которого оно построено
+        self._prompt_cache = None
+        self._prompt_cache_key = None
+        # Попытка загрузить VFS из CSV
+        if vfs_path and os.path.exists(vfs_path):
+            try:
+                self.vfs = VirtualFileSystem(vfs_path)
+                print(f"[INFO] VFS loaded successfully from {vfs_path}")
+            except Exception as e:
+                print(f"[ERROR] Failed to load VFS: {e}")
+
+    def format_prompt(self):
+        # Формирует приглашение к вводу (username@host:cwd$)
+        cwd_display = self.vfs.cwd if self.vfs else "~"
+        if cwd_display != self._prompt_cache_key:
+            self._prompt_cache = self.prompt_template.format(user=self.user, host=self.host, cwd=cwd_display)
+            self._prompt_cache_key = cwd_display
+        return self._prompt_cache
+
+    #  команды
+    def cmd_ls(self, args):
+        # Вывод содержимого каталога (опционально с режимом -l)
+        if not self.vfs:
+            print("[stub] ls")
+            return
+        if args and args[0] == "-l":
+            try:
+                node = self.vfs._cwd_dir()
+                if node is None:
+                    raise VFSException(f"No such file or directory: {self.vfs.cwd}")
+                # Вывод собирается целиком и пишется одним вызовом
+                out = [f"{format_mode(node.children[name].mode)} {name}\n"
+                       for name in node.sorted_names()]
+                sys.stdout.write("".join(out))
+            except VFSException as e:
+                print(f"ls: {e}")
+        else:
+            try:
+                print("  ".join(self.vfs.ls()))
+            except VFSException as e:
+                print(f"ls: {e}")
+
+    def cmd_cd(self, args):
+        # Переход в указанный каталог
+        if not self.vfs:
+            print("[stub] cd")
+            return
+        target = args[0] if args else "/"
+        try:
+            self.vfs.cd(target)
+        except VFSException as e:
+            print(f"cd: {e}")
+
+    def cmd_tree(self, args):
+        # Рекурсивное отображение структуры каталогов (tree [-L DEPTH] [PATH])
+        if not self.vfs:
+            print("[stub] tree")
+            return
+        max_depth = None
+        path = None
+        i = 0
+        while i < len(args):
+            if args[i] == "-L":
+                if i + 1 >= len(args) or not args[i + 1].isdigit():
+                    print("Usage: tree [-L DEPTH] [PATH]")
+                    return
+                max_depth = int(args[i + 1])
+                i += 2
+            else:
+                path = args[i]
+                i += 1
+        try:
+            print(self.vfs.tree(path, max_depth))
+        except VFSException as e:
+            print(f"tree: {e}")
+
+    def cmd_vfs_info(self, args):
+        # Вывод информации о текущей виртуальной файловой системе
+        if not self.vfs:
+            print("No VFS loaded.")
+            return
+        try:
+            info = self.vfs.vfs_info()
+        except VFSException as e:
+            print(f"vfs-info: {e}")
+            return
+        print(f"VFS file: {info['filename']}")
+        print(f"SHA-256 : {info['sha256']}")
+
+    def cmd_uname(self, args):
+        # Имитация системной команды uname
+        print(_UNAME)
+
+    def cmd_whoami(self, args):
+        # Возвращает имя текущего пользователя
+        print(self.user)
+
+    def cmd_chmod(self, args):
+        # Изменение прав доступа (chmod MODE PATH)
+        if not self.vfs:
+            print("No VFS loaded.")
+            return
+        if len(args) != 2:
+            print("Usage: chmod MODE PATH")
+            return
+        try:
+            self.vfs.chmod(args[1], args[0])
+        except VFSException as e:
+            print(f"chmod: {e}")
+
+    def cmd_rm(self, args):
+        # Удаление файлов или каталогов (-r для рекурсивного)
+        if not self.vfs:
+            print("No VFS loaded.")
+            return
+        recursive = False
+        paths = []
+        for a in args:
+            if a in ("-r", "-R"):
+                recursive = True
+            else:
+                paths.append(a)
+        if not paths:
+            print("Usage: rm [-r] PATH ...")
+            return
+        for p in paths:
+            try:
+                self.vfs.rm(p, recursive=recursive)
+            except VFSException as e:
+                print(f"rm: {e}")
+
+    def cmd_exit(self, args):
+        # Завершает работу эмулятора
+        print("Exiting emulator.")
+        self.running = False
+
+    # диспетчер команд
+    # Таблица строится один раз при создании класса (несвязанные методы)
+    _CMD_TABLE = {
+        "ls": cmd_ls,
+        "cd": cmd_cd,
+        "tree": cmd_tree,
+        "vfs-info": cmd_vfs_info,
+        "uname": cmd_uname,
+        "whoami": cmd_whoami,
+        "chmod": cmd_chmod,
+        "rm": cmd_rm,
+        "exit": cmd_exit,
+    }
+
+    def run_command(self, cmd, args):
+        # Вызывает нужный обработчик по имени команды
+        handler = self._CMD_TABLE.get(cmd)
+        if handler is not None:
+            handler(self, args)
+        else:
+            print(f"Unknown command: {cmd}")
+
+    def _compile_script(self, lines):
+        # Разбирает строки скрипта в список (номер строки, текст, команда, аргументы)
+        ops = []
+        for lineno, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line[0] == "#":
+                continue
+            cmd, *args = line.split()
+            ops.append((lineno, line, cmd, args))
+        return ops
+
+    def run_script(self, script_path):
+        # Выполняет команды из стартового скрипта (startup.txt)
+        # Путь разрешается один раз: сразу open(), без отдельной проверки exists()
+        try:
+            f = open(script_path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            print(f"[INFO] No startup script found ({script_path})")
+            return
+        # Читаем скрипт целиком и разбиваем на строки за один проход
+        with f:
+            lines = f.read().splitlines()
+        # Сначала весь скрипт разбирается, затем команды выполняются
+        ops = self._compile_script(lines)
+        print(f"\n[INFO] Executing startup script: {script_path}\n")
+        for _lineno, line, cmd, args in ops:
+            sys.stdout.write(self.format_prompt() + line + "\n")
+            self.run_command(cmd, args)
+            if not self.running:
+                sys.stdout.flush()
+                return
+        print("\n[INFO] Startup script finished.\n")
+        sys.stdout.flush()
+
+    def repl(self):
+        # Основной REPL-цикл (интерактивный режим)
+        while self.running:
+            try:
+                line = input(self.format_prompt())
+            except EOFError:
+                print()
+                break
+            tokens = line.split()
+            if not tokens:
+                continue
+            cmd, *args = tokens
+            self.run_command(cmd, args)
+
+
+def main():
+    # Точка входа: загрузка VFS и запуск скрипта / REPL
+    vfs_path = os.path.join(os.getcwd(), "vfs_nested.csv")
+    emulator = ShellEmulator(vfs_path=vfs_path)
+    startup = os.path.join(os.getcwd(), "startup.txt")
+    emulator.run_script(startup)
+    if emulator.running:
+        emulator.repl()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,16 @@
 
 from __future__ import annotations
 import csv
+import functools
 import os
 import hashlib
+import itertools
+import mmap
 import base64
+import bisect
 import posixpath
-from typing import Optional, Dict, List
+import sys
+from typing import Optional, Dict, List, Tuple
 
 
 class VFSException(Exception):
@@ -16,6 +21,8 @@ class VFSException(Exception):
 
 class VEntry:
     # Общая база для файла и каталога
+    __slots__ = ("name", "parent", "mode")
+
     def __init__(self, name: str, parent: Optional["VDirectory"] = None, mode: Optional[int] = None):
         self.name = name
         self.parent = parent
@@ -33,109 +40,199 @@ class VEntry:
 
 class VFile(VEntry):
     # Представление файла
+    __slots__ = ("content", "_decoded")
+
     def __init__(self, name: str, content: str = "", parent: Optional["VDirectory"] = None, mode: Optional[int] = None):
         super().__init__(name, parent, mode or 0o644)
         self.content = content
+        # Результат base64-декодирования; заполняется при первом чтении
+        self._decoded: Optional[bytes] = None
 
     def read(self, decode_base64: bool = False) -> bytes:
         # Возвращает содержимое файла (опционально декодируя base64)
         if decode_base64:
-            return base64.b64decode(self.content)
+            if self._decoded is None:
+                self._decoded = base64.b64decode(self.content)
+            return self._decoded
         return self.content.encode("utf-8")
 
 
 class VDirectory(VEntry):
     # Каталог с дочерними элементами
+    __slots__ = ("children", "_sorted_keys")
+
     def __init__(self, name: str, parent: Optional["VDirectory"] = None, mode: Optional[int] = None):
         super().__init__(name, parent, mode or 0o755)
         self.children: Dict[str, VEntry] = {}
+        # Отсортированные имена детей; строятся при первом запросе
+        self._sorted_keys: Optional[List[str]] = None
 
     def add_child(self, entry: VEntry):
         entry.parent = self
+        if self._sorted_keys is not None and entry.name not in self.children:
+            bisect.insort(self._sorted_keys, entry.name)
         self.children[entry.name] = entry
 
     def get_child(self, name: str) -> Optional[VEntry]:
         return self.children.get(name)
 
+    def remove_child(self, name: str):
+        del self.children[name]
+        if self._sorted_keys is not None:
+            del self._sorted_keys[bisect.bisect_left(self._sorted_keys, name)]
+
+    def clear(self):
+        self.children.clear()
+        self._sorted_keys = None
+
+    def sorted_names(self) -> List[str]:
+        # Возвращает внутренний список, изменять его нельзя
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self.children)
+        return self._sorted_keys
+
+
+# Тройка прав 'rwx' -> восьмеричная цифра
+_TRIP_LUT = {
+    "---": 0, "--x": 1, "-w-": 2, "-wx": 3,
+    "r--": 4, "r-x": 5, "rw-": 6, "rwx": 7,
+}
+
+
+def _mk_triplet(v: int) -> str:
+    return ("r" if v & 4 else "-") + ("w" if v & 2 else "-") + ("x" if v & 1 else "-")
+
+
+# Все 512 вариантов rwx-строки, считаются один раз при импорте
+_MODE_STR: Tuple[str, ...] = tuple(
+    _mk_triplet((m >> 6) & 0o7) + _mk_triplet((m >> 3) & 0o7) + _mk_triplet(m & 0o7)
+    for m in range(512)
+)
+
 
 def format_mode(mode_int: int) -> str:
     # Преобразует числовые права в rwx-строку
-    s = ""
-    for shift in (6, 3, 0):
-        v = (mode_int >> shift) & 0o7
-        s += "r" if v & 4 else "-"
-        s += "w" if v & 2 else "-"
-        s += "x" if v & 1 else "-"
-    return s
+    return _MODE_STR[mode_int & 0o777]
+
+
+@functools.lru_cache(maxsize=4096)
+def _norm_abs(p: str) -> str:
+    # Нормализует абсолютный путь; результат зависит только от строки, поэтому кэшируется
+    # Быстрый путь: без "..", "." и повторных "/" достаточно убрать хвостовой "/"
+    if ".." not in p and "/./" not in p and "//" not in p and not p.endswith("/."):
+        return p.rstrip("/") or "/"
+    norm = posixpath.normpath(p)
+    return "/" if norm == "." else norm
 
 
 class VirtualFileSystem:
     def __init__(self, csv_path: str):
         self.source_path = csv_path
+        self._basename = os.path.basename(csv_path)
         self.root = VDirectory("")
         self.cwd = "/"
-        self.sha256 = None
+        # Узел текущего каталога; None, если его удалили через rm
+        self._cwd_node: Optional[VDirectory] = self.root
+        self.sha256 = None  # считается лениво при первом vfs_info()
         self._load_csv(csv_path)
 
     #вспомогательные
     def _normalize_posix(self, p: str) -> str:
         # Нормализация пути в POSIX-формате
-        p = p.replace("\\", "/")
+        if "\\" in p:
+            p = p.replace("\\", "/")
         if not p.startswith("/"):
-            p = posixpath.join(self.cwd, p)
-        norm = posixpath.normpath(p)
-        return "/" if norm == "." else norm
+            p = self.cwd + "/" + p if self.cwd != "/" else "/" + p
+        return _norm_abs(p)
 
-    def _compute_sha256(self, data: bytes) -> str:
-        # Хэш содержимого CSV
+    def _compute_sha256(self, csv_path: str) -> str:
+        # Хэш содержимого CSV: файл отображается в память и подаётся
+        # в hashlib срезами memoryview по 1 МиБ без копирования в bytes
         h = hashlib.sha256()
-        h.update(data)
+        with open(csv_path, "rb") as bf:
+            if os.fstat(bf.fileno()).st_size == 0:
+                return h.hexdigest()  # mmap не принимает пустые файлы
+            with mmap.mmap(bf.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as mv:
+                for i in range(0, len(mv), 1 << 20):
+                    h.update(mv[i:i + (1 << 20)])
         return h.hexdigest()
 
     #загрузка CSV
     def _load_csv(self, csv_path: str):
         if not os.path.isfile(csv_path):
             raise VFSException(f"CSV not found: {csv_path}")
-        with open(csv_path, "rb") as bf:
-            data = bf.read()
-            self.sha256 = self._compute_sha256(data)
-        lines = data.decode("utf-8").splitlines()
-        reader = csv.reader(lines)
-        rows = list(reader)
-        if rows and "path" in rows[0]:
-            rows = rows[1:]  # пропускаем заголовок
-        for row in rows:
-            if len(row) < 2:
-                continue
-            path, typ = row[0].strip(), row[1].strip().lower()
-            content = row[2].strip() if len(row) > 2 else ""
-            if not path.startswith("/"):
-                path = "/" + path
-            if typ == "dir":
-                self._ensure_dir(path)
-            elif typ == "file":
-                parent_dir = posixpath.dirname(path)
-                name = posixpath.basename(path)
-                parent = self._ensure_dir(parent_dir)
-                parent.add_child(VFile(name, content))
-
-    def _ensure_dir(self, abs_path: str) -> VDirectory:
-        # Создаёт недостающие каталоги по пути
-        abs_path = self._normalize_posix(abs_path)
-        if abs_path == "/":
-            return self.root
-        parts = [p for p in abs_path.split("/") if p]
-        node = self.root
-        for seg in parts:
-            child = node.get_child(seg)
-            if child is None:
-                newdir = VDirectory(seg)
-                node.add_child(newdir)
-                node = newdir
-            elif isinstance(child, VDirectory):
-                node = child
+        # Строки разбираются по одной прямо из файла, без промежуточного списка.
+        # csv.reader реализован на C (_csv) и допускает строки разной длины
+        # (например "/assets,dir"), поэтому сторонние парсеры не нужны
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            first = next(reader, None)
+            if first is None:
+                return
+            header = [c.strip().lower() for c in first]
+            if "path" in header:
+                # Номера колонок вычисляются один раз по заголовку
+                cols = (header.index("path"),
+                        header.index("type") if "type" in header else 1,
+                        header.index("content") if "content" in header else -1)
+                rows = reader
             else:
-                raise VFSException(f"Path conflict at {seg}")
+                # Без заголовка первая строка — уже данные
+                cols = (0, 1, 2)
+                rows = itertools.chain([first], reader)
+            # Индекс "абсолютный путь -> каталог" живёт только во время загрузки
+            # "" — родитель путей вида "/name" после rpartition("/")
+            index: Dict[str, VDirectory] = {"/": self.root, "": self.root}
+            # Горячий цикл: функции и методы заранее связаны с локальными именами
+            pi, ti, ci = cols
+            _intern = sys.intern
+            _VFile = VFile
+            normalize = self._normalize_posix
+            load_dir = self._load_dir
+            for row in rows:
+                rlen = len(row)
+                if pi >= rlen or ti >= rlen:
+                    continue
+                path, typ = row[pi].strip(), row[ti].strip().lower()
+                content = row[ci].strip() if 0 <= ci < rlen else ""
+                # Ведущие "//" normpath сохраняет, поэтому приводим к одному "/"
+                path = normalize("/" + path.lstrip("/"))
+                if typ == "dir":
+                    load_dir(path, index)
+                elif typ == "file":
+                    # Родитель и имя получаются одним разбиением строки
+                    parent_path, _, name = path.rpartition("/")
+                    parent = load_dir(parent_path, index)
+                    name = _intern(name)
+                    if isinstance(parent.get_child(name), VDirectory):
+                        # Файл заменяет каталог: убираем из индекса его и всех
+                        # потомков, иначе строки ниже попадут в отцепленный узел
+                        prefix = path + "/"
+                        for key in [k for k in index if k == path or k.startswith(prefix)]:
+                            del index[key]
+                    parent.add_child(_VFile(name, content))
+
+    def _load_dir(self, abs_path: str, index: Dict[str, VDirectory]) -> VDirectory:
+        # Каталог по нормализованному пути: поднимаемся через rpartition до пути,
+        # уже известного индексу, затем создаём недостающие каталоги сверху вниз
+        missing = []
+        node = index.get(abs_path)
+        while node is None:
+            parent_path, _, name = abs_path.rpartition("/")
+            missing.append((abs_path, name))
+            abs_path = parent_path
+            node = index.get(abs_path)
+        for abs_path, name in reversed(missing):
+            # Одинаковые имена (src, bin, ...) разделяют один объект строки
+            name = sys.intern(name)
+            child = node.get_child(name)
+            if child is None:
+                child = VDirectory(name)
+                node.add_child(child)
+            elif not isinstance(child, VDirectory):
+                raise VFSException(f"Path conflict at {name}")
+            index[abs_path] = child
+            node = child
         return node
 
     def _get_node(self, abs_path: str) -> Optional[VEntry]:
@@ -143,27 +240,43 @@ class VirtualFileSystem:
         abs_path = self._normalize_posix(abs_path)
         if abs_path == "/":
             return self.root
-        parts = [p for p in abs_path.split("/") if p]
         node: VEntry = self.root
-        for seg in parts:
-            if not isinstance(node, VDirectory):
+        for seg in abs_path.split("/"):
+            if not seg:
+                continue
+            # У файла нет атрибута children — значит, дальше идти некуда
+            children = getattr(node, "children", None)
+            if children is None:
                 return None
-            node = node.get_child(seg)
+            node = children.get(seg)
             if node is None:
                 return None
         return node
 
+    def _cwd_dir(self) -> Optional[VEntry]:
+        # Текущий каталог без повторного обхода пути от корня
+        if self._cwd_node is None:
+            return self._get_node(self.cwd)
+        return self._cwd_node
+
     #  команды
     def vfs_info(self):
-        return {"filename": os.path.basename(self.source_path), "sha256": self.sha256}
+        # Хэш считается при первом вызове, поэтому отражает CSV на этот момент,
+        # а не на момент загрузки VFS
+        if self.sha256 is None:
+            try:
+                self.sha256 = self._compute_sha256(self.source_path)
+            except OSError as e:
+                raise VFSException(f"Cannot read {self.source_path}: {e.strerror or e}")
+        return {"filename": self._basename, "sha256": self.sha256}
 
     def ls(self, path: Optional[str] = None) -> List[str]:
         target = self.cwd if path is None else path
-        node = self._get_node(target)
+        node = self._cwd_dir() if path is None else self._get_node(target)
         if node is None:
             raise VFSException(f"No such file or directory: {target}")
         if isinstance(node, VDirectory):
-            return sorted(node.children.keys())
+            return list(node.sorted_names())
         return [node.name]
 
     def cd(self, path: str):
@@ -172,22 +285,26 @@ class VirtualFileSystem:
         if node is None or not isinstance(node, VDirectory):
             raise VFSException(f"No such directory: {path}")
         self.cwd = abs_path
+        self._cwd_node = node
 
-    def tree(self, path: Optional[str] = None) -> str:
-        # Рекурсивно строит дерево каталогов
-        start = self._get_node(path or self.cwd)
+    def tree(self, path: Optional[str] = None, max_depth: Optional[int] = None) -> str:
+        # Строит дерево каталогов обходом в глубину через явный стек;
+        # max_depth ограничивает глубину вывода (None — без ограничения)
+        start = self._get_node(path) if path else self._cwd_dir()
         if start is None:
             raise VFSException("No such path")
         lines = []
-
-        def _recurse(n: VEntry, prefix=""):
-            name = n.name if n.parent else "/"
-            lines.append(prefix + name)
-            if isinstance(n, VDirectory):
-                for k in sorted(n.children.keys()):
-                    _recurse(n.children[k], prefix + "  ")
-
-        _recurse(start)
+        append = lines.append
+        stack = [(start, "", 0)]
+        while stack:
+            n, prefix, depth = stack.pop()
+            append(prefix + (n.name if n.parent else "/"))
+            if isinstance(n, VDirectory) and (max_depth is None or depth < max_depth):
+                # В обратном порядке, чтобы первым со стека снимался первый по алфавиту
+                child_prefix = prefix + "  "
+                children = n.children
+                for k in reversed(n.sorted_names()):
+                    stack.append((children[k], child_prefix, depth + 1))
         return "\n".join(lines)
 
     def read_file(self, path: str) -> bytes:
@@ -202,13 +319,11 @@ class VirtualFileSystem:
         s = mode_str.strip()
         if s.isdigit() or s.startswith("0o"):
             return int(s, 8)
-        if len(s) == 9 and all(c in "rwx-" for c in s):
-            vals = []
-            for i in range(0, 9, 3):
-                trip = s[i:i+3]
-                v = (4 if trip[0]=="r" else 0) | (2 if trip[1]=="w" else 0) | (1 if trip[2]=="x" else 0)
-                vals.append(v)
-            return (vals[0]<<6)|(vals[1]<<3)|vals[2]
+        if len(s) == 9:
+            try:
+                return (_TRIP_LUT[s[0:3]]<<6)|(_TRIP_LUT[s[3:6]]<<3)|_TRIP_LUT[s[6:9]]
+            except KeyError:
+                pass
         raise VFSException("Invalid mode format")
 
     def chmod(self, path: str, mode_str: str):
@@ -229,17 +344,27 @@ class VirtualFileSystem:
         if not isinstance(parent, VDirectory):
             raise VFSException("Parent not directory")
         if isinstance(node, VFile):
-            del parent.children[node.name]
+            parent.remove_child(node.name)
         elif isinstance(node, VDirectory):
             if node.children and not recursive:
                 raise VFSException(f"Directory not empty: {path}")
             if recursive:
                 self._remove_recursive(node)
-            del parent.children[node.name]
+            parent.remove_child(node.name)
+            # Сравнение по узлам, а не по строкам: у каталога бывает несколько
+            # написаний пути (например, с ведущим "//"). Цепочка .parent
+            # у удалённого поддерева сохраняется
+            n = self._cwd_node
+            while n is not None:
+                if n is node:
+                    self._cwd_node = None
+                    break
+                n = n.parent
 
     def _remove_recursive(self, node: VDirectory):
-        # Удаляет каталог со всем содержимым
-        for child in list(node.children.values()):
-            if isinstance(child, VDirectory):
-                self._remove_recursive(child)
-        node.children.clear()
+        # Удаляет каталог со всем содержимым (обход через явный стек)
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            stack.extend(c for c in n.children.values() if isinstance(c, VDirectory))
+            n.clear()